@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
+import re
 
 from libnmstate.schema import Ethernet
 from libnmstate.schema import Interface
@@ -29,16 +30,25 @@ from .base_iface import BaseIface
 
 BNXT_DRIVER_PHYS_PORT_PREFIX = "p"
 MULTIPORT_PCI_DEVICE_PREFIX = "n"
+_MULTIPORT_PREFIX = MULTIPORT_PCI_DEVICE_PREFIX + BNXT_DRIVER_PHYS_PORT_PREFIX
 
 DUPLEX_VALID_VALUES = ["full", "half"]
 
+_VF_MAC_RE = re.compile(r"^([a-fA-F0-9]{2}:){3,31}[a-fA-F0-9]{2}$")
+
 
 class EthernetIface(BaseIface):
     IS_GENERATED_VF_METADATA = "_is_generated_vf"
 
-    def __init__(self, info, save_to_disk=True):
+    def __init__(self, info, save_to_disk=True, is_generated_vf=False):
         super().__init__(info, save_to_disk)
         self._is_peer = False
+        # The generated vf metadata cannot be part of the original dict and
+        # is only ever stored as True.
+        if is_generated_vf:
+            self._info[EthernetIface.IS_GENERATED_VF_METADATA] = True
+        else:
+            self._info.pop(EthernetIface.IS_GENERATED_VF_METADATA, None)
 
     def merge(self, other):
         super().merge(other)
@@ -50,37 +60,35 @@ class EthernetIface(BaseIface):
         * AUTO_NEGOTIATION: true: Remove speed and duplex
         * AUTO_NEGOTIATION: false: copy speed/duplex from other if not defined
         """
-        if state.get(Ethernet.CONFIG_SUBTREE, {}).get(
-            Ethernet.AUTO_NEGOTIATION
-        ):
-            state.get(Ethernet.CONFIG_SUBTREE, {}).pop(Ethernet.SPEED, None)
-            state.get(Ethernet.CONFIG_SUBTREE, {}).pop(Ethernet.DUPLEX, None)
+        eth_config = state.get(Ethernet.CONFIG_SUBTREE)
+        if eth_config and eth_config.get(Ethernet.AUTO_NEGOTIATION):
+            eth_config.pop(Ethernet.SPEED, None)
+            eth_config.pop(Ethernet.DUPLEX, None)
 
     def state_for_verify(self):
         state = super().state_for_verify()
-        _capitalize_sriov_vf_mac(state)
-        EthernetIface._canonicalize(state)
+        if state.get(Ethernet.CONFIG_SUBTREE):
+            _capitalize_sriov_vf_mac(state)
+            EthernetIface._canonicalize(state)
         if self.is_generated_vf:
             # The VF state is unpredictable when PF is changing total_vfs count
             # Just don't verify generated VF state.
             state.pop(Interface.STATE, None)
         return state
 
+    def _config(self):
+        return self.raw.get(Ethernet.CONFIG_SUBTREE) or {}
+
+    def _sriov(self):
+        return self._config().get(Ethernet.SRIOV_SUBTREE) or {}
+
     @property
     def sriov_total_vfs(self):
-        return (
-            self.raw.get(Ethernet.CONFIG_SUBTREE, {})
-            .get(Ethernet.SRIOV_SUBTREE, {})
-            .get(Ethernet.SRIOV.TOTAL_VFS, 0)
-        )
+        return self._sriov().get(Ethernet.SRIOV.TOTAL_VFS, 0)
 
     @property
     def sriov_vfs(self):
-        return (
-            self.raw.get(Ethernet.CONFIG_SUBTREE, {})
-            .get(Ethernet.SRIOV_SUBTREE, {})
-            .get(Ethernet.SRIOV.VFS_SUBTREE, [])
-        )
+        return self._sriov().get(Ethernet.SRIOV.VFS_SUBTREE, ())
 
     @property
     def is_peer(self):
@@ -88,23 +96,19 @@ class EthernetIface(BaseIface):
 
     @property
     def is_sriov(self):
-        return self.raw.get(Ethernet.CONFIG_SUBTREE, {}).get(
-            Ethernet.SRIOV_SUBTREE
-        )
+        return self._config().get(Ethernet.SRIOV_SUBTREE)
 
     @property
     def speed(self):
-        return self.raw.get(Ethernet.CONFIG_SUBTREE, {}).get(Ethernet.SPEED)
+        return self._config().get(Ethernet.SPEED)
 
     @property
     def auto_negotiation(self):
-        return self.raw.get(Ethernet.CONFIG_SUBTREE, {}).get(
-            Ethernet.AUTO_NEGOTIATION
-        )
+        return self._config().get(Ethernet.AUTO_NEGOTIATION)
 
     @property
     def duplex(self):
-        return self.raw.get(Ethernet.CONFIG_SUBTREE, {}).get(Ethernet.DUPLEX)
+        return self._config().get(Ethernet.DUPLEX)
 
     def pre_edit_validation_and_cleanup(self):
         self._validate_ethernet_properties()
@@ -117,31 +121,23 @@ class EthernetIface(BaseIface):
         validate_integer(
             self.sriov_total_vfs, Ethernet.SRIOV.TOTAL_VFS, minimum=0
         )
+        vf_keys = Ethernet.SRIOV.VFS
+        vf_id_key = vf_keys.ID
+        mac_key = vf_keys.MAC_ADDRESS
+        spoof_check_key = vf_keys.SPOOF_CHECK
+        trust_key = vf_keys.TRUST
+        max_tx_rate_key = vf_keys.MAX_TX_RATE
+        min_tx_rate_key = vf_keys.MIN_TX_RATE
         for vf in self.sriov_vfs:
+            validate_integer(vf.get(vf_id_key), vf_id_key, minimum=0)
+            validate_string(vf.get(mac_key), mac_key, pattern=_VF_MAC_RE)
+            validate_boolean(vf.get(spoof_check_key), spoof_check_key)
+            validate_boolean(vf.get(trust_key), trust_key)
             validate_integer(
-                vf.get(Ethernet.SRIOV.VFS.ID), Ethernet.SRIOV.VFS.ID, minimum=0
-            )
-            validate_string(
-                vf.get(Ethernet.SRIOV.VFS.MAC_ADDRESS),
-                Ethernet.SRIOV.VFS.MAC_ADDRESS,
-                pattern="^([a-fA-F0-9]{2}:){3,31}[a-fA-F0-9]{2}$",
-            )
-            validate_boolean(
-                vf.get(Ethernet.SRIOV.VFS.SPOOF_CHECK),
-                Ethernet.SRIOV.VFS.SPOOF_CHECK,
-            )
-            validate_boolean(
-                vf.get(Ethernet.SRIOV.VFS.TRUST), Ethernet.SRIOV.VFS.TRUST
-            )
-            validate_integer(
-                vf.get(Ethernet.SRIOV.VFS.MAX_TX_RATE),
-                Ethernet.SRIOV.VFS.MAX_TX_RATE,
-                minimum=0,
+                vf.get(max_tx_rate_key), max_tx_rate_key, minimum=0
             )
             validate_integer(
-                vf.get(Ethernet.SRIOV.VFS.MIN_TX_RATE),
-                Ethernet.SRIOV.VFS.MIN_TX_RATE,
-                minimum=0,
+                vf.get(min_tx_rate_key), min_tx_rate_key, minimum=0
             )
 
     def create_sriov_vf_ifaces(self):
@@ -160,60 +156,60 @@ class EthernetIface(BaseIface):
         # If the NIC is following the standard pattern "pfname+v+vfid", this
         # split will not touch it and the vf_pattern will be the PF name.
         # Ref: https://bugzilla.redhat.com/1959679
+        total_vfs = self.sriov_total_vfs
+        if not total_vfs:
+            return []
+
         vf_pattern = self.name
-        multiport_pattern = (
-            MULTIPORT_PCI_DEVICE_PREFIX + BNXT_DRIVER_PHYS_PORT_PREFIX
-        )
-        if len(self.name.split(multiport_pattern)) == 2:
-            vf_pattern = self.name.split(multiport_pattern)[0]
+        head, sep, tail = vf_pattern.partition(_MULTIPORT_PREFIX)
+        if sep and _MULTIPORT_PREFIX not in tail:
+            vf_pattern = head
 
-        vf_ifaces = [
-            EthernetIface(
+        iface_cls = EthernetIface
+        name_key = Interface.NAME
+        type_key = Interface.TYPE
+        state_key = Interface.STATE
+        eth_type = InterfaceType.ETHERNET
+        down_state = InterfaceState.DOWN
+
+        return [
+            iface_cls(
                 {
                     # According to manpage of systemd.net-naming-scheme(7),
                     # SRIOV VF interface will have v{slot} in device name.
                     # Currently, nmstate has no intention to support
                     # user-defined udev rule on SRIOV interface naming policy.
-                    Interface.NAME: f"{vf_pattern}v{i}",
-                    Interface.TYPE: InterfaceType.ETHERNET,
+                    name_key: f"{vf_pattern}v{i}",
+                    type_key: eth_type,
                     # VF will be in DOWN state initialy
-                    Interface.STATE: InterfaceState.DOWN,
-                }
+                    state_key: down_state,
+                },
+                is_generated_vf=True,
             )
-            for i in range(0, self.sriov_total_vfs)
+            for i in range(total_vfs)
         ]
-        # The generated vf metadata cannot be part of the original dict.
-        for vf in vf_ifaces:
-            vf._info[EthernetIface.IS_GENERATED_VF_METADATA] = True
-
-        return vf_ifaces
 
     @property
     def is_generated_vf(self):
-        return self._info.get(EthernetIface.IS_GENERATED_VF_METADATA) is True
+        return EthernetIface.IS_GENERATED_VF_METADATA in self._info
 
     def remove_vfs_entry_when_total_vfs_decreased(self):
-        vfs_count = len(
-            self._info[Ethernet.CONFIG_SUBTREE]
-            .get(Ethernet.SRIOV_SUBTREE, {})
-            .get(Ethernet.SRIOV.VFS_SUBTREE, [])
-        )
-        if vfs_count > self.sriov_total_vfs:
-            [
-                self._info[Ethernet.CONFIG_SUBTREE][Ethernet.SRIOV_SUBTREE][
-                    Ethernet.SRIOV.VFS_SUBTREE
-                ].pop()
-                for _ in range(self.sriov_total_vfs, vfs_count)
-            ]
+        sriov_config = self._sriov()
+        vfs = sriov_config.get(Ethernet.SRIOV.VFS_SUBTREE)
+        total_vfs = sriov_config.get(Ethernet.SRIOV.TOTAL_VFS, 0)
+        if vfs is not None and len(vfs) > total_vfs:
+            del vfs[total_vfs:]
 
     def get_delete_vf_interface_names(self, old_sriov_total_vfs):
+        base_name = self.name + "v"
         return [
-            f"{self.name}v{i}"
+            f"{base_name}{i}"
             for i in range(self.sriov_total_vfs, old_sriov_total_vfs)
         ]
 
     def check_total_vfs_matches_vf_list(self, total_vfs):
-        return total_vfs == len(self.sriov_vfs)
+        vfs = self._sriov().get(Ethernet.SRIOV.VFS_SUBTREE) or ()
+        return total_vfs == len(vfs)
 
 
 def _capitalize_sriov_vf_mac(state):
@@ -222,7 +218,8 @@ def _capitalize_sriov_vf_mac(state):
         .get(Ethernet.SRIOV_SUBTREE, {})
         .get(Ethernet.SRIOV.VFS_SUBTREE, [])
     )
+    mac_key = Ethernet.SRIOV.VFS.MAC_ADDRESS
     for vf in vfs:
-        vf_mac = vf.get(Ethernet.SRIOV.VFS.MAC_ADDRESS)
-        if vf_mac:
-            vf[Ethernet.SRIOV.VFS.MAC_ADDRESS] = vf_mac.upper()
+        vf_mac = vf.get(mac_key)
+        if vf_mac and not vf_mac.isupper():
+            vf[mac_key] = vf_mac.upper()
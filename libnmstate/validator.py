@@ -78,11 +78,15 @@ def validate_string(value, name, valid_values=None, pattern=None):
             f"Property {name} with value {value} is not a valid value from "
             f"the list {valid_values}"
         )
-    elif pattern and not re.match(pattern, value):
-        raise NmstateValueError(
-            f"Property {name} with value {value} does not match the required "
-            f"pattern {pattern}"
-        )
+    elif pattern:
+        # Accept both string and precompiled patterns
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        if not pattern.match(value):
+            raise NmstateValueError(
+                f"Property {name} with value {value} does not match the "
+                f"required pattern {pattern.pattern}"
+            )
 
 
 def validate_boolean(value, name):
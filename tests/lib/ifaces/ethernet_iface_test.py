@@ -291,3 +291,115 @@ class TestEthernetIface:
         }
         iface = EthernetIface(iface_info)
         iface.pre_edit_validation_and_cleanup()
+
+    def test_create_sriov_vf_ifaces(self):
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Ethernet.CONFIG_SUBTREE: {
+                Ethernet.SRIOV_SUBTREE: {Ethernet.SRIOV.TOTAL_VFS: 2},
+            },
+        }
+        iface = EthernetIface(iface_info)
+        vf_ifaces = iface.create_sriov_vf_ifaces()
+
+        assert [vf.name for vf in vf_ifaces] == ["foov0", "foov1"]
+        for vf in vf_ifaces:
+            assert vf.is_generated_vf
+            assert vf.state == InterfaceState.DOWN
+
+    def test_create_sriov_vf_ifaces_without_total_vfs(self):
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+        }
+        iface = EthernetIface(iface_info)
+
+        assert iface.create_sriov_vf_ifaces() == []
+
+    @pytest.mark.parametrize(
+        "pf_name,expected_vf_name",
+        [
+            ("ens2f0np0", "ens2f0v0"),
+            ("ens2f0", "ens2f0v0"),
+            ("enp3s0f0np0", "enp3s0f0np0v0"),
+        ],
+    )
+    def test_create_sriov_vf_ifaces_name_pattern(
+        self, pf_name, expected_vf_name
+    ):
+        iface_info = {
+            Interface.NAME: pf_name,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Ethernet.CONFIG_SUBTREE: {
+                Ethernet.SRIOV_SUBTREE: {Ethernet.SRIOV.TOTAL_VFS: 1},
+            },
+        }
+        iface = EthernetIface(iface_info)
+
+        assert [vf.name for vf in iface.create_sriov_vf_ifaces()] == [
+            expected_vf_name
+        ]
+
+    @pytest.mark.parametrize("metadata_value", [False, True])
+    def test_generated_vf_metadata_ignored_from_info(self, metadata_value):
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            EthernetIface.IS_GENERATED_VF_METADATA: metadata_value,
+        }
+        iface = EthernetIface(iface_info)
+
+        assert not iface.is_generated_vf
+        assert EthernetIface.IS_GENERATED_VF_METADATA not in iface.to_dict()
+
+    def test_remove_vfs_entry_when_total_vfs_decreased(self):
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Ethernet.CONFIG_SUBTREE: {
+                Ethernet.SRIOV_SUBTREE: {
+                    Ethernet.SRIOV.TOTAL_VFS: 1,
+                    Ethernet.SRIOV.VFS_SUBTREE: [
+                        {Ethernet.SRIOV.VFS.ID: 0},
+                        {Ethernet.SRIOV.VFS.ID: 1},
+                        {Ethernet.SRIOV.VFS.ID: 2},
+                    ],
+                },
+            },
+        }
+        iface = EthernetIface(iface_info)
+        iface.remove_vfs_entry_when_total_vfs_decreased()
+
+        assert iface.sriov_vfs == [{Ethernet.SRIOV.VFS.ID: 0}]
+
+    def test_remove_vfs_entry_without_vfs(self):
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Ethernet.CONFIG_SUBTREE: {
+                Ethernet.SRIOV_SUBTREE: {Ethernet.SRIOV.TOTAL_VFS: 1},
+            },
+        }
+        iface = EthernetIface(iface_info)
+        expected_info = iface.to_dict()
+        iface.remove_vfs_entry_when_total_vfs_decreased()
+
+        assert iface.to_dict() == expected_info
+
+    def test_remove_vfs_entry_when_total_vfs_matches(self):
+        vfs = [{Ethernet.SRIOV.VFS.ID: 0}, {Ethernet.SRIOV.VFS.ID: 1}]
+        iface_info = {
+            Interface.NAME: FOO_IFACE_NAME,
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Ethernet.CONFIG_SUBTREE: {
+                Ethernet.SRIOV_SUBTREE: {
+                    Ethernet.SRIOV.TOTAL_VFS: 2,
+                    Ethernet.SRIOV.VFS_SUBTREE: deepcopy(vfs),
+                },
+            },
+        }
+        iface = EthernetIface(iface_info)
+        iface.remove_vfs_entry_when_total_vfs_decreased()
+
+        assert iface.sriov_vfs == vfs
@@ -17,6 +17,8 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import re
+
 import pytest
 
 from libnmstate.error import NmstateValueError
@@ -83,3 +85,14 @@ def test_validate_wrong_string():
 def test_validate_not_valid_string():
     with pytest.raises(NmstateValueError):
         validate_string("notvalid", FOO_PROPERTY, ["valid"])
+
+
+def test_validate_string_with_compiled_pattern():
+    validate_string("ab:cd", FOO_PROPERTY, pattern=re.compile("^ab:"))
+
+
+def test_validate_string_not_matching_compiled_pattern():
+    with pytest.raises(NmstateValueError) as err:
+        validate_string("cd:ab", FOO_PROPERTY, pattern=re.compile("^ab:"))
+    assert "required pattern ^ab:" in str(err.value)
+    assert "re.compile" not in str(err.value)